@@ -21,6 +21,7 @@ interface ConversationItem {
     full_text: string;
     language: string;
   } | null;
+  // 来自 payload.timestamp：Unix 纪元毫秒
   timestamp: number;
 }
 
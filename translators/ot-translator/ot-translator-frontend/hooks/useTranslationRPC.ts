@@ -1,12 +1,13 @@
 import { TranslationData } from '@/lib/types';
 import { useMaybeRoomContext } from '@livekit/components-react';
 import { RpcInvocationData } from 'livekit-client';
-import { useEffect } from 'react';
+import { useEffect, useRef } from 'react';
 
 export function useTranslationRPC(
   onTranslationReceived: (payload: TranslationData) => void
 ) {
   const room = useMaybeRoomContext();
+  const lastSeqRef = useRef(-1);
 
   useEffect(() => {
     if (!room || !room.localParticipant) return;
@@ -18,6 +19,14 @@ export function useTranslationRPC(
         const payload = JSON.parse(rpcInvocation.payload) as TranslationData;
 
         if (payload && payload.original) {
+          // interim 在后端异步发送，可能乱序到达：丢弃比已处理消息更旧的 interim
+          if (typeof payload.seq === 'number') {
+            if (payload.type === 'interim' && payload.seq <= lastSeqRef.current) {
+              return 'Ignored: stale interim';
+            }
+            lastSeqRef.current = Math.max(lastSeqRef.current, payload.seq);
+          }
+
           onTranslationReceived(payload);
           return 'Success: Translation received';
         } else {
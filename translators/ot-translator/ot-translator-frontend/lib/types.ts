@@ -33,6 +33,8 @@ export interface SandboxConfig {
 
 export interface TranslationData {
   type: 'interim' | 'final';
+  // 单调递增的消息序号（用于丢弃乱序到达的过期 interim）
+  seq?: number;
   original: {
     full_text: string;
     delta: string;
@@ -47,5 +49,6 @@ export interface TranslationData {
     // 向后兼容旧字段
     text?: string;
   } | null;
+  // 发送时间：Unix 纪元毫秒（整数，与 Date.now() 同单位），不是秒
   timestamp: number;
 }
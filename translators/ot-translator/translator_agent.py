@@ -15,20 +15,43 @@ demonstrates:
 """
 
 from pathlib import Path
+from dataclasses import dataclass
 from dotenv import load_dotenv
 from livekit.agents import JobContext, WorkerOptions, cli
 from livekit.agents.voice import Agent, AgentSession
+from livekit.agents.stt import SpeechEventType
 from livekit.plugins import silero, deepgram, azure
 from livekit import rtc
-from typing import Optional, AsyncIterable, List, Callable, Dict
-from google.cloud import translate_v2 as translate
+from typing import Optional, AsyncIterable, List, Callable, Dict, NamedTuple
+from google.cloud import translate_v3 as translate
+from google.api_core import exceptions as google_exceptions, retry_async
+import google.auth
 import sys
 import json
 import logging
 import asyncio
 import time
 import os
-from dataclasses import dataclass
+import re
+import string
+import heapq
+import hashlib
+from collections import OrderedDict, defaultdict
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis 为可选依赖，仅在配置 TRANSLATION_CACHE_REDIS_URL 时使用
+    aioredis = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop 为可选依赖（不支持 Windows），未安装时使用默认事件循环
+    uvloop = None
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
@@ -37,91 +60,348 @@ load_dotenv(dotenv_path=Path(__file__).parent.parent.parent / '.env')
 logger = logging.getLogger("translator")
 logger.setLevel(logging.INFO)
 
+# RPC payload 的 JSON 编解码：优先使用 orjson
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Google Translate v3 单次请求限制：最多 1024 条文本，总计 30k 码位
+MAX_CONTENTS_PER_REQUEST = 1024
+MAX_CODEPOINTS_PER_REQUEST = 30000
+
+# 同时进行的 Translate API 调用上限（interim、批量翻译、语言检测共享）
+MAX_CONCURRENT_REQUESTS = 4
+
+# 限流（429）或服务暂时不可用时的重试策略：带抖动的指数退避，总时长不超过 5 秒
+_TRANSLATE_RETRY = retry_async.AsyncRetry(
+    predicate=retry_async.if_exception_type(
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+    ),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=5.0,
+)
+
+# interim RPC 合并窗口（秒）：窗口内只发送最新的一条
+INTERIM_FLUSH_DELAY = 0.05
+
+# Redis 翻译缓存的连接/读写超时（秒）：Redis 卡住时按未命中处理，不阻塞 final 翻译
+REDIS_CACHE_TIMEOUT = 0.25
+
+# 同时在途的 interim RPC 上限：网络变慢时取消最旧的（已被更新的 interim 取代）
+MAX_INFLIGHT_INTERIM_RPCS = 8
+
+# 语言检测的可靠文本长度（字符）：句段较短时的检测结果只是临时结果，句段增长到该长度后重新检测一次
+DETECT_RELIABLE_CHARS = 20
+
+# 批量翻译耗时目标（秒）：翻译耗时超过该值时按比例缩短批量等待时间，低于时使用配置的超时
+BATCH_LATENCY_TARGET = 0.8
+
+# final 结果缺号等待上限（秒）：超过后跳过缺失的序号，避免一次失败阻塞后续所有字幕
+DISPATCH_STALL_TIMEOUT = 10.0
+
+# STT 使用的区域语言代码 -> Google Translate 语言代码
+# 只合并译文相同的区域变体；zh-TW 等有独立译文的代码保持不变
+_LANG_MAP = {
+    "en-US": "en", "en-GB": "en", "en-AU": "en", "en-CA": "en", "en-IN": "en",
+    "zh-CN": "zh", "zh-Hans": "zh", "zh-Hans-CN": "zh",
+    "ja-JP": "ja", "ko-KR": "ko",
+    "fr-FR": "fr", "de-DE": "de", "es-ES": "es", "it-IT": "it", "ru-RU": "ru",
+}
+
+# 双向模式：检测到的语言（代码前两位）-> 翻译方向
+_LANG_TO_PAIR = {"zh": ("zh", "en"), "en": ("en", "zh")}
+
+# STT 返回的语言标签（"en-US"、"zh-CN"）-> 前两位小写短代码，首次出现时计算并缓存
+_LOCALE_SHORT: Dict[str, str] = {}
+
+
+def _short_language(code: str) -> str:
+    """语言标签 -> 前两位小写短代码（"zh-CN" -> "zh"），结果缓存并驻留"""
+    short = _LOCALE_SHORT.get(code)
+    if short is None:
+        short = _LOCALE_SHORT[code] = sys.intern(code[:2].lower())
+    return short
+
+
+# 常见拼音音节：Azure 把中文误识别为英文时，文本常呈现为拼音
+_PINYIN_RE = re.compile(r'(?i)\b(?:ni|hao|ma|shi|xiexie|tamen)\b')
+
+# 汉字：文本中出现即可确定为中文，无需调用语言检测 API
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+# 句子边界：英文标点后需跟空白（捕获标点前的词，用于排除缩写），中文标点可直接结束
+_SENTENCE_BOUNDARY_RE = re.compile(r'([^\s.!?。！？]*)([.!?]+)\s+|[。！？]\s*')
+
+# 句点不表示句子结束的常见缩写（小写，不含句点；"e.g."、"U.S." 等由单字母规则排除）
+_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "no", "inc", "ltd", "co", "approx",
+})
+
+# interim 仅追加这些字符时无需重新翻译
+_TRIVIAL_CHARS = string.whitespace + string.punctuation + "，。！？、；：“”‘’（）…"
 
-@dataclass
-class PendingSentence:
-    """待翻译的句子"""
+# 拼接译文时不需要空格分隔的目标语言
+_NO_SPACE_LANGUAGES = {"zh", "ja"}
+
+# 布尔型环境变量的真值写法
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in _TRUTHY
+
+
+def _env_number(name: str, default, cast: Callable):
+    """解析数值环境变量，格式错误时记录警告并使用默认值（避免 worker 在导入时崩溃）"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Invalid {name}={value!r}, using default {default}")
+        return default
+
+
+@dataclass(frozen=True)
+class TranslatorConfig:
+    """来自环境变量的翻译配置（进程启动时解析一次，各任务共享）"""
+    source_language: str
+    target_language: str
+    debounce_ms: float
+    debounce_enabled: bool
+    batch_size: int
+    batch_timeout_ms: float
+    sync_display_mode: bool
+    bidirectional_mode: bool
+    stt_provider: str
+    cache_redis_url: Optional[str]
+    
+    @classmethod
+    def from_env(cls) -> "TranslatorConfig":
+        # STT 提供商配置（默认 deepgram）
+        stt_provider = os.getenv("STT_PROVIDER", "deepgram").strip().lower()
+        if stt_provider not in ("deepgram", "azure"):
+            logger.warning(f"Invalid STT_PROVIDER '{stt_provider}', falling back to 'deepgram'")
+            stt_provider = "deepgram"
+        
+        return cls(
+            # 默认配置：英语到中文，500ms 防抖
+            source_language=os.getenv("TRANSLATION_SOURCE_LANGUAGE", "en"),
+            target_language=os.getenv("TRANSLATION_TARGET_LANGUAGE", "zh"),
+            debounce_ms=_env_number("TRANSLATION_DEBOUNCE_MS", 500.0, float),
+            debounce_enabled=_env_flag("TRANSLATION_DEBOUNCE_ENABLED", "true"),
+            # 批量翻译配置
+            batch_size=_env_number("TRANSLATION_BATCH_SIZE", 3, int),
+            batch_timeout_ms=_env_number("TRANSLATION_BATCH_TIMEOUT_MS", 2000.0, float),  # 2秒，匹配实际语速
+            # 显示模式配置（默认异步模式）
+            sync_display_mode=_env_flag("TRANSLATION_SYNC_DISPLAY_MODE", "false"),
+            # 双向翻译模式配置（默认关闭）
+            bidirectional_mode=_env_flag("TRANSLATION_BIDIRECTIONAL_MODE", "false"),
+            stt_provider=stt_provider,
+            # 可选：Redis 句子翻译缓存（跨会话共享）
+            cache_redis_url=os.getenv("TRANSLATION_CACHE_REDIS_URL") or None,
+        )
+
+
+CONFIG = TranslatorConfig.from_env()
+
+
+def _last_sentence_boundary(text: str) -> int:
+    """最后一个句子边界的结束位置（没有时为 0）：跳过缩写、单字母或数字后的句点，以及后接小写字母的英文标点"""
+    boundary = 0
+    for match in _SENTENCE_BOUNDARY_RE.finditer(text):
+        punct = match.group(2)
+        if punct is not None:
+            end = match.end()
+            if end < len(text) and text[end].islower():
+                continue
+            token = match.group(1).lstrip("(\"'“‘")
+            if punct[-1] == "." and (len(token) <= 1 or token.isdigit() or token.lower() in _ABBREVIATIONS):
+                continue
+        boundary = match.end()
+    return boundary
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """最长公共前缀长度：二分比较切片（C 层比较），避免逐字符的 Python 循环"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _chunk_contents(texts: List[str]) -> List[List[str]]:
+    """按 v3 API 的单次请求限制切分文本列表"""
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_len = 0
+    for text in texts:
+        if current and (
+            len(current) >= MAX_CONTENTS_PER_REQUEST
+            or current_len + len(text) > MAX_CODEPOINTS_PER_REQUEST
+        ):
+            chunks.append(current)
+            current = []
+            current_len = 0
+        current.append(text)
+        current_len += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class PendingSentence(NamedTuple):
+    """待翻译的句子（不可变，无实例 __dict__）"""
     sequence: int          # 全局序号
     text: str             # 原文
-    timestamp: float      # 接收时间
+    timestamp: float      # 接收时间（time.monotonic）
     detected_language: Optional[str] = None  # 检测到的语言
+    segment_language: Optional[str] = None   # interim 阶段 Google 检测到的句段语言
 
 
 class AdaptiveBatchCollector:
     """
     自适应批量收集器
-    - 批次为空：立即翻译（无额外延迟）
-    - 批次有句子：加入批量（利用批量优势）
+    - 无积压（批次为空且没有进行中的翻译）：立即翻译（无额外延迟）
+    - 有积压：加入批量，达到批次大小、超时或上一批翻译完成时发送（利用批量优势）
+    - 背压：进行中的批次达到上限时继续累积（批次变大），累积超过上限时最旧的句子不翻译，
+      交给 overflow_callback 直接发送原文（不丢句、不占用分发器的序号）
     """
     
+    __slots__ = (
+        "batch_size",
+        "batch_timeout",
+        "translate_callback",
+        "overflow_callback",
+        "max_inflight_batches",
+        "max_pending",
+        "pending_batch",
+        "batch_timer",
+        "_timeout_expired",
+        "latency_ema",
+        "_flush_tasks",
+    )
+    
     def __init__(
         self, 
         batch_size: int = 3,
         batch_timeout_ms: float = 500,
-        translate_callback: Callable = None
+        translate_callback: Callable = None,
+        max_inflight_batches: int = MAX_CONCURRENT_REQUESTS,
+        max_pending: int = 100,
+        overflow_callback: Optional[Callable] = None
     ):
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout_ms / 1000
         self.translate_callback = translate_callback
+        # 积压超过上限时接收最旧的句子（PendingSentence），不翻译直接发送
+        self.overflow_callback = overflow_callback
+        self.max_inflight_batches = max_inflight_batches
+        self.max_pending = max_pending
         
         self.pending_batch: List[PendingSentence] = []
-        self.batch_timer: Optional[asyncio.Task] = None
-        self.lock = asyncio.Lock()
+        # 超时定时器用 TimerHandle（call_later），比只为 sleep 创建一个 Task 更轻量
+        self.batch_timer: Optional[asyncio.TimerHandle] = None
+        # 当前批次已超时但没有空闲的翻译槽位：槽位空出时立即发送
+        self._timeout_expired = False
+        # 进行中的批量翻译任务（保持引用，防止被垃圾回收）及其开始时间
+        self._flush_tasks: Dict[asyncio.Task, float] = {}
+        # 批量翻译耗时的指数移动平均（秒），用于调整超时
+        self.latency_ema: Optional[float] = None
     
-    async def add_sentence(self, sequence: int, text: str, detected_language: Optional[str] = None):
+    def add_sentence(
+        self,
+        sequence: int,
+        text: str,
+        detected_language: Optional[str] = None,
+        segment_language: Optional[str] = None
+    ):
         """
-        添加句子到批次
+        添加句子到批次（不等待翻译，可直接在 STT 循环中调用）
         
         核心逻辑：
         1. 如果批次为空 → 立即触发翻译
         2. 如果批次不为空 → 加入批次，等待触发
         """
-        async with self.lock:
-            sentence = PendingSentence(
-                sequence=sequence,
-                text=text,
-                timestamp=time.time(),
-                detected_language=detected_language
-            )
-            
-            # 🔑 关键判断：批次是否为空
-            is_batch_empty = len(self.pending_batch) == 0
-            
-            self.pending_batch.append(sentence)
+        # 单线程事件循环：整个方法没有 await，无需加锁
+        sentence = PendingSentence(
+            sequence=sequence,
+            text=text,
+            timestamp=time.monotonic(),
+            detected_language=detected_language,
+            segment_language=segment_language
+        )
+        
+        # 🔑 关键判断：批次是否为空，且没有正在进行的批量翻译
+        is_batch_empty = not self.pending_batch and not self._flush_tasks
+        
+        self.pending_batch.append(sentence)
+        
+        if is_batch_empty:
+            # 情况1：批次为空，说明没有积压
+            # → 立即翻译，不等待
+            logger.info(f"[ADAPTIVE] seq={sequence}, batch empty, immediate translation")
+            self._flush_batch()
+        else:
+            # 情况2：批次已有句子，说明有积压
+            # → 利用批量优势
+            logger.info(f"[ADAPTIVE] seq={sequence}, batch has {len(self.pending_batch)} sentences")
             
-            if is_batch_empty:
-                # 情况1：批次为空，说明没有积压
-                # → 立即翻译，不等待
-                logger.info(f"[ADAPTIVE] seq={sequence}, batch empty, immediate translation")
-                await self._flush_batch()
-            else:
-                # 情况2：批次已有句子，说明有积压
-                # → 利用批量优势
-                logger.info(f"[ADAPTIVE] seq={sequence}, batch has {len(self.pending_batch)} sentences")
-                
-                if len(self.pending_batch) >= self.batch_size:
+            if len(self.pending_batch) >= self.batch_size:
+                if len(self._flush_tasks) < self.max_inflight_batches:
                     # 达到批次大小，立即批量翻译
                     logger.info(f"[ADAPTIVE] Batch size reached, flushing")
-                    await self._flush_batch()
-                else:
-                    # 启动定时器，超时后批量翻译
-                    if self.batch_timer:
-                        self.batch_timer.cancel()
-                    self.batch_timer = asyncio.create_task(self._delayed_flush())
-    
-    async def _delayed_flush(self):
-        """延迟触发批量翻译"""
-        await asyncio.sleep(self.batch_timeout)
-        async with self.lock:
-            if self.pending_batch:
-                logger.info(f"[ADAPTIVE] Batch timeout, flushing {len(self.pending_batch)} sentences")
-                await self._flush_batch()
-    
-    async def _flush_batch(self):
-        """执行批量翻译"""
+                    self._flush_batch()
+                elif len(self.pending_batch) > self.max_pending:
+                    # API 严重滞后：最旧的句子不再翻译，直接发送原文，限制内存和延迟；
+                    # 序号照常交给分发器，后续已翻译的句子不会因缺号被阻塞
+                    overflow = self.pending_batch.pop(0)
+                    logger.warning(f"[ADAPTIVE] Backlog full, sending seq={overflow.sequence} untranslated")
+                    if self.overflow_callback:
+                        self.overflow_callback(overflow)
+                # 否则等待进行中的批次完成，积压的句子合并为更大的批次
+            elif self.batch_timer is None and not self._timeout_expired:
+                # 启动定时器，超时后批量翻译（从批次中最早的句子开始计时，新句子不会推迟超时）
+                self.batch_timer = asyncio.get_running_loop().call_later(
+                    self._current_timeout(), self._on_batch_timeout
+                )
+    
+    def _current_timeout(self) -> float:
+        """按翻译耗时调整超时：未超过耗时目标时使用配置的超时，超过时按比例缩短"""
+        if self.latency_ema is None or self.latency_ema <= BATCH_LATENCY_TARGET:
+            return self.batch_timeout
+        return max(0.05, self.batch_timeout * BATCH_LATENCY_TARGET / self.latency_ema)
+    
+    def _on_batch_timeout(self):
+        """定时器到期：触发批量翻译（进行中的批次已达上限时记下超时，由完成回调在槽位空出时发送）"""
+        self.batch_timer = None
+        if not self.pending_batch:
+            return
+        if len(self._flush_tasks) < self.max_inflight_batches:
+            logger.info(f"[ADAPTIVE] Batch timeout, flushing {len(self.pending_batch)} sentences")
+            self._flush_batch()
+        else:
+            self._timeout_expired = True
+    
+    def _flush_batch(self):
+        """取出当前批次，在后台任务中执行批量翻译"""
         if not self.pending_batch:
             return
         
+        # 取出并重置批次，翻译期间新到的句子进入下一批
         batch = self.pending_batch
         self.pending_batch = []
         
@@ -129,17 +409,167 @@ class AdaptiveBatchCollector:
         if self.batch_timer:
             self.batch_timer.cancel()
             self.batch_timer = None
+        self._timeout_expired = False
         
-        # 调用翻译回调
+        # 调用翻译回调（结果顺序由 OrderedDispatcher 保证）
         if self.translate_callback:
-            await self.translate_callback(batch)
+            task = asyncio.create_task(self.translate_callback(batch))
+            self._flush_tasks[task] = time.monotonic()
+            task.add_done_callback(self._on_flush_done)
+    
+    def _on_flush_done(self, task: asyncio.Task):
+        """批量翻译完成：已无进行中的翻译、积压已满一批或已超时时，立即发送积压的句子"""
+        elapsed = time.monotonic() - self._flush_tasks.pop(task)
+        if self.latency_ema is None:
+            self.latency_ema = elapsed
+        else:
+            self.latency_ema = 0.8 * self.latency_ema + 0.2 * elapsed
+        if self.pending_batch and (
+            not self._flush_tasks
+            or len(self.pending_batch) >= self.batch_size
+            or self._timeout_expired
+        ):
+            logger.info(f"[ADAPTIVE] Translation slot free, flushing {len(self.pending_batch)} sentences")
+            self._flush_batch()
+
+
+class TranslationCache:
+    """
+    句子翻译缓存：口语中常重复短句（"yes", "thank you"）
+    - 进程内 LRU（按语言对分桶）
+    - 可选 Redis 二级缓存：跨会话、跨 worker 共享，Redis 出错时按未命中处理
+    """
+    
+    __slots__ = ("_max_entries", "_ttl", "_local", "_redis", "_write_tasks")
+    
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 14 * 24 * 3600
+    ):
+        self._local: Dict[tuple, OrderedDict[str, str]] = defaultdict(OrderedDict)
+        self._max_entries = max_entries  # 每个语言对的容量
+        self._ttl = ttl_seconds
+        self._redis = None
+        # 后台进行中的 Redis 写入任务（持有引用，避免被垃圾回收）
+        self._write_tasks: set = set()
+        if redis_url:
+            if aioredis is None:
+                logger.warning("TRANSLATION_CACHE_REDIS_URL is set but the redis package is not installed")
+            else:
+                self._redis = aioredis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_timeout=REDIS_CACHE_TIMEOUT,
+                    socket_connect_timeout=REDIS_CACHE_TIMEOUT
+                )
+                logger.info("Translation cache backed by Redis")
+    
+    @staticmethod
+    def _redis_key(source_language: str, target_language: str, text: str) -> str:
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        return f"translation:{source_language}:{target_language}:{digest}"
+    
+    def _put_local(self, bucket: OrderedDict, text: str, translated: str):
+        bucket[text] = translated
+        if len(bucket) > self._max_entries:
+            bucket.popitem(last=False)
+    
+    async def get_many(
+        self,
+        source_language: str,
+        target_language: str,
+        texts: List[str]
+    ) -> List[Optional[str]]:
+        """查询缓存，未命中的位置为 None"""
+        bucket = self._local[(source_language, target_language)]
+        results: List[Optional[str]] = []
+        miss_indices: List[int] = []
+        for i, text in enumerate(texts):
+            key = text.strip()
+            cached = bucket.get(key)
+            if cached is not None:
+                bucket.move_to_end(key)
+            else:
+                miss_indices.append(i)
+            results.append(cached)
+        
+        if self._redis is None or not miss_indices:
+            return results
+        
+        try:
+            values = await self._redis.mget(
+                [self._redis_key(source_language, target_language, texts[i].strip()) for i in miss_indices]
+            )
+        except Exception as e:
+            logger.debug(f"Redis cache lookup failed: {e}")
+            return results
+        
+        # Redis 命中的条目回填到进程内缓存
+        for i, value in zip(miss_indices, values):
+            if value is not None:
+                results[i] = value
+                self._put_local(bucket, texts[i].strip(), value)
+        return results
+    
+    def put_many(
+        self,
+        source_language: str,
+        target_language: str,
+        texts: List[str],
+        translations: List[Optional[str]]
+    ):
+        """写入翻译结果（跳过失败的 None）：进程内立即写入，Redis 在后台写入，不等待"""
+        bucket = self._local[(source_language, target_language)]
+        entries = []
+        for text, translated in zip(texts, translations):
+            if translated is not None:
+                key = text.strip()
+                self._put_local(bucket, key, translated)
+                entries.append((key, translated))
+        
+        if self._redis is None or not entries:
+            return
+        
+        task = asyncio.create_task(self._write_redis(source_language, target_language, entries))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+    
+    async def _write_redis(self, source_language: str, target_language: str, entries: List[tuple]):
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, translated in entries:
+                    pipe.set(self._redis_key(source_language, target_language, key), translated, ex=self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Redis cache write failed: {e}")
+    
+    async def aclose(self):
+        """等待后台写入完成后关闭 Redis 连接"""
+        if self._write_tasks:
+            await asyncio.gather(*self._write_tasks, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
 
 
 class BatchTranslator:
     """批量翻译器：调用Google Translate批量API"""
     
-    def __init__(self, translate_client):
+    __slots__ = ("translate_client", "parent", "api_semaphore", "cache")
+    
+    def __init__(
+        self,
+        translate_client,
+        parent: Optional[str],
+        api_semaphore: Optional[asyncio.Semaphore] = None,
+        cache: Optional[TranslationCache] = None
+    ):
         self.translate_client = translate_client
+        self.parent = parent
+        self.api_semaphore = api_semaphore or asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.cache = cache or TranslationCache()
     
     async def translate_batch(
         self,
@@ -148,7 +578,7 @@ class BatchTranslator:
         target_language: str
     ) -> List[Optional[str]]:
         """
-        批量翻译多个文本
+        批量翻译多个文本（命中缓存的句子不再调用 API）
         
         Args:
             texts: 文本列表 ["Hello", "How are you", ...]
@@ -162,29 +592,98 @@ class BatchTranslator:
         if source_language == target_language:
             return texts
         
+        # 无积压时批次只有一句（最常见情况）：走单句路径，省去拆分/合并的列表操作
+        if len(texts) == 1:
+            return [await self._translate_one(texts[0], source_language, target_language)]
+        
+        # 拆分为缓存命中和未命中两部分，只翻译未命中的句子
+        results = await self.cache.get_many(source_language, target_language, texts)
+        miss_indices = [i for i, cached in enumerate(results) if cached is None]
+        
+        if not miss_indices:
+            logger.info(f"[BATCH] All {len(texts)} texts served from cache")
+            return results
+        
+        # 批次内重复的句子（如 "OK"）只翻译一次
+        miss_texts = list(dict.fromkeys(texts[i].strip() for i in miss_indices))
+        translations = await self._request_batch(miss_texts, source_language, target_language)
+        
+        # 合并结果并写入缓存
+        translated_by_text = dict(zip(miss_texts, translations))
+        for i in miss_indices:
+            results[i] = translated_by_text[texts[i].strip()]
+        self.cache.put_many(source_language, target_language, miss_texts, translations)
+        
+        return results
+    
+    def _build_request(
+        self,
+        contents: List[str],
+        source_language: Optional[str],
+        target_language: str
+    ) -> dict:
+        """构建 translate_text 请求；source_language 为 None 时由 Google 检测源语言"""
+        # mime_type='text/plain' 避免 HTML 实体编码 (&#39; -> ')
+        # contents 与缓存键一致去除首尾空白：单条与批量路径发送相同的输入
+        request = {
+            "parent": self.parent,
+            "contents": [text.strip() for text in contents],
+            "mime_type": "text/plain",
+            "target_language_code": target_language,
+        }
+        if source_language is not None:
+            request["source_language_code"] = source_language
+        return request
+    
+    async def _translate_one(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str
+    ) -> Optional[str]:
+        """翻译单个句子（先查缓存），失败时返回 None"""
+        cached = (await self.cache.get_many(source_language, target_language, [text]))[0]
+        if cached is not None:
+            return cached
+        
         try:
-            start_time = time.time()
-            
-            # ✅ 批量调用 Google Translate API
-            # API支持传入列表
-            # format_='text' 避免 HTML 实体编码 (&#39; -> ')
-            results = self.translate_client.translate(
-                texts,
-                target_language=target_language,
-                source_language=source_language,
-                format_='text'  # 返回纯文本，不使用 HTML 实体
-            )
-            
-            elapsed_ms = (time.time() - start_time) * 1000
+            start_time = time.monotonic()
+            async with self.api_semaphore:
+                response = await self.translate_client.translate_text(
+                    request=self._build_request([text], source_language, target_language),
+                    retry=_TRANSLATE_RETRY
+                )
+            translated = response.translations[0].translated_text
+            logger.info(f"[BATCH] Translated 1 text in {(time.monotonic() - start_time) * 1000:.0f}ms")
+        except Exception as e:
+            logger.error(f"Batch translation error: {e}")
+            return None
+        
+        self.cache.put_many(source_language, target_language, [text], [translated])
+        return translated
+    
+    async def _request_batch(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str
+    ) -> List[Optional[str]]:
+        """调用 Google Translate 批量 API，失败时返回 None 列表"""
+        try:
+            start_time = time.monotonic()
             
-            # 提取翻译结果
+            # ✅ 批量调用 Google Translate v3 API
+            # contents 支持传入列表，超出单次请求限制时拆分
             translations = []
-            if isinstance(results, list):
-                for result in results:
-                    translations.append(result.get('translatedText'))
-            else:
-                # 单个结果的情况
-                translations.append(results.get('translatedText'))
+            for contents in _chunk_contents(texts):
+                async with self.api_semaphore:
+                    response = await self.translate_client.translate_text(
+                        request=self._build_request(contents, source_language, target_language),
+                        retry=_TRANSLATE_RETRY
+                    )
+                translations.extend(t.translated_text for t in response.translations)
+            
+            elapsed_ms = (time.monotonic() - start_time) * 1000
             
             logger.info(
                 f"[BATCH] Translated {len(texts)} texts in {elapsed_ms:.0f}ms "
@@ -197,6 +696,42 @@ class BatchTranslator:
             logger.error(f"Batch translation error: {e}")
             # 失败时返回None列表
             return [None] * len(texts)
+    
+    async def translate_detect(
+        self,
+        texts: List[str],
+        target_language: str
+    ) -> List[tuple]:
+        """
+        不指定源语言翻译：Google 在同一次请求中返回检测到的源语言，无需单独调用 detect_language
+        
+        Returns:
+            [(译文, 检测到的语言代码), ...]，失败时为 (None, None)
+        """
+        try:
+            results = []
+            for contents in _chunk_contents(texts):
+                async with self.api_semaphore:
+                    response = await self.translate_client.translate_text(
+                        request=self._build_request(contents, None, target_language),
+                        retry=_TRANSLATE_RETRY
+                    )
+                results.extend((t.translated_text, t.detected_language_code) for t in response.translations)
+        except Exception as e:
+            logger.error(f"Batch translation error: {e}")
+            return [(None, None)] * len(texts)
+        
+        # 按检测到的源语言写入缓存
+        by_source: Dict[str, tuple] = defaultdict(lambda: ([], []))
+        for text, (translated, detected) in zip(texts, results):
+            source = _LANG_MAP.get(detected, detected) if detected else None
+            if source and source != target_language:
+                by_source[source][0].append(text)
+                by_source[source][1].append(translated)
+        for source, (source_texts, translations) in by_source.items():
+            self.cache.put_many(source, target_language, source_texts, translations)
+        
+        return results
 
 
 class OrderedDispatcher:
@@ -209,13 +744,27 @@ class OrderedDispatcher:
     - 如果句子2先完成，也要等句子1发送后再发送
     """
     
-    def __init__(self, send_callback: Callable):
+    __slots__ = (
+        "send_callback",
+        "stall_timeout",
+        "next_sequence",
+        "_heap",
+        "_flush_task",
+        "_stall_timer",
+    )
+    
+    def __init__(self, send_callback: Callable, stall_timeout: float = DISPATCH_STALL_TIMEOUT):
         self.send_callback = send_callback
+        self.stall_timeout = stall_timeout
         self.next_sequence = 0  # 下一个应该发送的序号
-        self.pending_results: Dict[int, dict] = {}  # {sequence: {original, translated, orig_lang, trans_lang}}
-        self.lock = asyncio.Lock()
+        # 最小堆：(sequence, original, translated, orig_lang, trans_lang)，堆顶即最小序号
+        self._heap: List[tuple] = []
+        # 发送任务：按序发送已就绪的结果，与后续批次的翻译并行进行
+        self._flush_task: Optional[asyncio.Task] = None
+        # 缺号定时器：next_sequence 迟迟未到达时跳过
+        self._stall_timer: Optional[asyncio.TimerHandle] = None
     
-    async def add_result(
+    def add_result(
         self,
         sequence: int,
         original_text: str,
@@ -223,53 +772,150 @@ class OrderedDispatcher:
         original_language: Optional[str] = None,
         translation_language: Optional[str] = None
     ):
-        """添加翻译结果（包含语言信息）"""
-        async with self.lock:
-            self.pending_results[sequence] = {
-                "original": original_text,
-                "translated": translated_text,
-                "original_language": original_language,
-                "translation_language": translation_language
-            }
-            logger.debug(f"[DISPATCHER] Added seq={sequence}, next={self.next_sequence}")
-            await self._flush_results()
+        """添加翻译结果（包含语言信息），不等待发送完成"""
+        if sequence < self.next_sequence:
+            # 该序号已因超时被跳过，补发会打乱顺序
+            logger.warning(f"[DISPATCHER] Dropping late seq={sequence}, next={self.next_sequence}")
+            return
+        
+        heapq.heappush(
+            self._heap,
+            (sequence, original_text, translated_text, original_language, translation_language)
+        )
+        logger.debug("[DISPATCHER] Added seq=%d, next=%d", sequence, self.next_sequence)
+        
+        # 已有发送任务时由它继续处理；否则在下一个结果就绪时启动
+        if self._flush_task is None:
+            if self._heap[0][0] == self.next_sequence:
+                self._flush_task = asyncio.create_task(self._flush_results())
+            else:
+                self._arm_stall_timer()
     
-    async def _flush_results(self):
-        """按顺序发送所有可发送的结果"""
-        while self.next_sequence in self.pending_results:
-            result = self.pending_results.pop(self.next_sequence)
-            
-            logger.info(f"[DISPATCHER] Sending seq={self.next_sequence}")
-            
-            # 调用回调发送到前端（包含语言信息）
-            await self.send_callback(
-                original_text=result["original"],
-                translated_text=result["translated"],
-                original_language=result.get("original_language"),
-                translation_language=result.get("translation_language"),
-                is_final=True
+    def _arm_stall_timer(self):
+        """有结果在等待缺失的序号时开始计时"""
+        if self._stall_timer is None and self._heap:
+            self._stall_timer = asyncio.get_running_loop().call_later(
+                self.stall_timeout, self._on_stall, self.next_sequence
             )
-            
-            self.next_sequence += 1
+    
+    def _on_stall(self, waiting_for: int):
+        """缺号超时：期间没有进展则跳到堆中最小的序号"""
+        self._stall_timer = None
+        if self.next_sequence != waiting_for or self._flush_task is not None:
+            # 计时期间已有进展，重新计时
+            self._arm_stall_timer()
+            return
+        
+        heap = self._heap
+        if heap and heap[0][0] > waiting_for:
+            logger.warning(
+                f"[DISPATCHER] seq={waiting_for}..{heap[0][0] - 1} missing after "
+                f"{self.stall_timeout:.0f}s, skipping"
+            )
+            self.next_sequence = heap[0][0]
+            self._flush_task = asyncio.create_task(self._flush_results())
+    
+    async def _flush_results(self):
+        """按顺序发送所有可发送的结果
+        
+        同一时间只有一个发送任务：结果在 await 之前就从堆中弹出，
+        发送期间新加入的结果由当前循环继续处理，因此无需加锁
+        """
+        heap = self._heap
+        try:
+            while heap and heap[0][0] == self.next_sequence:
+                _, original, translated, original_language, translation_language = heapq.heappop(heap)
+                
+                logger.info(f"[DISPATCHER] Sending seq={self.next_sequence}")
+                
+                # 调用回调发送到前端（包含语言信息）
+                await self.send_callback(
+                    original_text=original,
+                    translated_text=translated,
+                    original_language=original_language,
+                    translation_language=translation_language,
+                    is_final=True
+                )
+                
+                self.next_sequence += 1
+        finally:
+            self._flush_task = None
+            # 剩余结果在等待缺失的序号
+            self._arm_stall_timer()
 
 
 class DebouncedTranslator:
     """处理带防抖的翻译请求"""
     
+    __slots__ = (
+        "debounce_delay",
+        "translate_client",
+        "parent",
+        "enabled",
+        "sync_mode",
+        "_cache",
+        "_cache_max",
+        "_inflight",
+        "api_semaphore",
+        "_latest",
+        "_deadline",
+        "_timer",
+        "_wake",
+        "_worker",
+        "_last_request",
+        "_current",
+        "_stable",
+    )
+    
     def __init__(self, debounce_ms: float = 500, enabled: bool = True, sync_mode: bool = False):
         self.debounce_delay = debounce_ms / 1000
-        self.pending_task: Optional[asyncio.Task] = None
         self.translate_client = None
+        self.parent: Optional[str] = None
         self.enabled = enabled
         self.sync_mode = sync_mode  # 同步模式：true=原文译文一起发送, false=原文先发送
         
-        # 初始化 Google Cloud Translate 客户端
+        # 翻译结果 LRU 缓存：interim 经常重复发送相同文本，命中时无需调用 API
+        # 按 (source, target) 语言对分桶，查找时只需 dict.get(text)；切换语言后旧桶保留可复用
+        self._cache: Dict[tuple, OrderedDict[str, str]] = defaultdict(OrderedDict)
+        self._cache_max = 1024  # 每个语言对的容量
+        
+        # 正在进行中的翻译请求（single-flight）：相同 key 的并发调用共享同一结果
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        
+        # 全局 API 并发上限：与批量翻译、语言检测共享，避免突发请求触发 429
+        self.api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        # 防抖状态：单个常驻 worker 任务 + 截止时间 + 单个定时器
+        # 新的 interim 只更新 _latest 和 _deadline，不再为每次请求创建/取消任务或定时器；
+        # 定时器触发时由 worker 重新读取截止时间，未到期则按剩余时间重新设置
+        self._latest: Optional[tuple] = None  # (text, source, target, callback, send_original)
+        self._deadline: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._wake = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        # 前沿触发：空闲后的第一条 interim 立即翻译，后续 interim 才进入尾部防抖
+        self._last_request = float("-inf")
+        # 正在进行的 interim 翻译（final 到达时取消，避免过期译文覆盖 final）
+        self._current: Optional[asyncio.Task] = None
+        
+        # 当前句段中已完成句子的原文/译文（按语言对区分），interim 只需翻译剩余部分
+        self._stable: tuple = ("", "", "", "")  # (source, target, stable_src, stable_tgt)
+        
+        # 初始化 Google Cloud Translate v3 客户端
+        # v3 API 需要项目 ID：优先读取 GOOGLE_CLOUD_PROJECT，否则使用凭证中的项目
         try:
-            self.translate_client = translate.Client()
-            logger.info("Google Cloud Translate client initialized successfully")
+            project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+            if not project_id:
+                _, project_id = google.auth.default()
+            if not project_id:
+                raise ValueError("Google Cloud project ID not found")
+            self.parent = f"projects/{project_id}/locations/global"
+            # 异步 gRPC 客户端：不阻塞事件循环，并发请求复用同一 HTTP/2 连接
+            self.translate_client = translate.TranslationServiceAsyncClient()
+            logger.info(f"Google Cloud Translate client initialized successfully (parent={self.parent})")
         except Exception as e:
             logger.error(f"Failed to initialize Google Translate client: {e}")
-            logger.error("Make sure GOOGLE_APPLICATION_CREDENTIALS is set correctly")
+            logger.error("Make sure GOOGLE_APPLICATION_CREDENTIALS and GOOGLE_CLOUD_PROJECT are set correctly")
     
     def update_debounce_delay(self, debounce_ms: float):
         """更新防抖延迟时间"""
@@ -283,10 +929,9 @@ class DebouncedTranslator:
 
         self.enabled = enabled
 
-        # 如果关闭防抖，取消任何待处理的任务
-        if not enabled and self.pending_task and not self.pending_task.done():
-            self.pending_task.cancel()
-            self.pending_task = None
+        # 如果关闭防抖，丢弃待处理的请求
+        if not enabled:
+            self._clear_pending()
 
         status = "enabled" if enabled else "disabled"
         logger.info(f"Debounced translation {status}")
@@ -311,27 +956,68 @@ class DebouncedTranslator:
             logger.error("Translate client not initialized")
             return None
         
+        # 如果源语言和目标语言相同，不需要翻译
+        if source_language == target_language:
+            return text
+        
+        # 命中缓存直接返回
+        bucket = self._cache[(source_language, target_language)]
+        cached = bucket.get(text)
+        if cached is not None:
+            bucket.move_to_end(text)
+            return cached
+        
+        # 相同文本已在翻译中：等待同一个请求的结果，不重复调用 API
+        key = (source_language, target_language, text)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        translated_text = None
+        try:
+            translated_text = await self._request_translation(text, source_language, target_language)
+            if translated_text is not None:
+                # 写入缓存，超出容量时淘汰最久未使用的条目
+                bucket[text] = translated_text
+                if len(bucket) > self._cache_max:
+                    bucket.popitem(last=False)
+            return translated_text
+        finally:
+            self._inflight.pop(key, None)
+            if not future.done():
+                future.set_result(translated_text)
+    
+    async def _request_translation(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str
+    ) -> Optional[str]:
+        """实际调用 Google Translate API，失败时返回 None"""
         try:
-            # 如果源语言和目标语言相同，不需要翻译
-            if source_language == target_language:
-                return text
-            
             # 记录开始时间
-            start_time = time.time()
+            start_time = time.monotonic()
             
-            # 调用 Google Translate API
-            # format_='text' 避免 HTML 实体编码 (&#39; -> ')
-            result = self.translate_client.translate(
-                text,
-                target_language=target_language,
-                source_language=source_language,
-                format_='text'  # 返回纯文本，不使用 HTML 实体
-            )
+            # 调用 Google Translate v3 API
+            # mime_type='text/plain' 避免 HTML 实体编码 (&#39; -> ')
+            async with self.api_semaphore:
+                response = await self.translate_client.translate_text(
+                    request={
+                        "parent": self.parent,
+                        "contents": [text],
+                        "mime_type": "text/plain",
+                        "source_language_code": source_language,
+                        "target_language_code": target_language,
+                    },
+                    retry=_TRANSLATE_RETRY
+                )
             
             # 计算耗时
-            elapsed_ms = (time.time() - start_time) * 1000
+            elapsed_ms = (time.monotonic() - start_time) * 1000
             
-            translated_text = result['translatedText']
+            translated_text = response.translations[0].translated_text
             logger.info(
                 "Translated (%s -> %s) in %.0fms: %s -> %s",
                 source_language,
@@ -346,6 +1032,159 @@ class DebouncedTranslator:
             logger.error(f"Translation error: {e}")
             return None
     
+    async def translate_interim(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str
+    ) -> Optional[str]:
+        """
+        增量翻译 interim 文本
+        
+        已完成的句子只翻译一次并保存译文，之后的 interim 只翻译未完成的部分再拼接。
+        只在句子边界处复用，避免半句译文拼接导致语序错误。
+        """
+        stable_source, stable_target, stable_src, stable_tgt = self._stable
+        if (stable_source, stable_target) != (source_language, target_language) or not text.startswith(stable_src):
+            # 语言对变化或前文被 STT 修正：重新开始
+            stable_src, stable_tgt = "", ""
+        
+        rest = text[len(stable_src):]
+        if not rest.strip():
+            # interim 与已翻译的稳定前缀相同（如修正回退到该前缀）：直接复用译文，不调用 API
+            return stable_tgt
+        
+        boundary = _last_sentence_boundary(rest)
+        head, tail = rest[:boundary], rest[boundary:]
+        if not tail.strip():
+            tail = ""
+        if head and tail:
+            head_tgt, tail_tgt = await asyncio.gather(
+                self.translate_text(head, source_language, target_language),
+                self.translate_text(tail, source_language, target_language),
+            )
+        elif head:
+            head_tgt, tail_tgt = await self.translate_text(head, source_language, target_language), ""
+        else:
+            head_tgt, tail_tgt = "", await self.translate_text(tail, source_language, target_language)
+        
+        if head_tgt is None or tail_tgt is None:
+            return None
+        
+        sep = "" if _short_language(target_language) in _NO_SPACE_LANGUAGES else " "
+        
+        def join(a: str, b: str) -> str:
+            return f"{a}{sep}{b}" if a and b else a or b
+        
+        if head:
+            stable_src += head
+            stable_tgt = join(stable_tgt, head_tgt.strip())
+        self._stable = (source_language, target_language, stable_src, stable_tgt)
+        
+        return join(stable_tgt, tail_tgt.strip())
+    
+    @property
+    def has_pending(self) -> bool:
+        """是否有尚未触发的防抖请求"""
+        return self._deadline is not None
+    
+    def _clear_pending(self) -> bool:
+        """丢弃尚未触发的防抖请求，返回是否存在待处理请求"""
+        had_pending = self._deadline is not None
+        self._latest = None
+        self._deadline = None
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return had_pending
+    
+    def _schedule(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        callback,
+        send_original: bool,
+        delay: float
+    ):
+        """记录最新请求并推迟截止时间，由常驻 worker 在截止时间到达后执行"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # 空闲状态（无待处理请求、无进行中翻译、距上次请求已超过防抖间隔）：立即翻译
+        idle = (
+            self._deadline is None
+            and self._current is None
+            and now - self._last_request >= delay
+        )
+        self._last_request = now
+        self._latest = (text, source_language, target_language, callback, send_original)
+        self._deadline = now if idle else now + delay
+        
+        # 只有没有定时器、或新截止时间更早时（如切换为无延迟）才设置定时器
+        if self._timer is None or self._deadline < self._timer.when():
+            if self._timer:
+                self._timer.cancel()
+            self._timer = loop.call_at(self._deadline, self._on_timer)
+        
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+    
+    def _on_timer(self):
+        """定时器到期：唤醒 worker"""
+        self._timer = None
+        self._wake.set()
+    
+    async def _run(self):
+        """常驻 worker：等待截止时间到达后翻译最新的文本"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            
+            if self._deadline is None:
+                continue
+            
+            # 截止时间已被新请求推迟：按剩余时间重新设置定时器
+            remaining = self._deadline - loop.time()
+            if remaining > 0:
+                if self._timer is None:
+                    self._timer = loop.call_later(remaining, self._on_timer)
+                continue
+            
+            text, source_language, target_language, callback, send_original = self._latest
+            self._latest = None
+            self._deadline = None
+            
+            # 在子任务中翻译，final 到达时可单独取消而不影响 worker
+            self._current = asyncio.create_task(
+                self._translate_and_send(text, source_language, target_language, callback, send_original)
+            )
+            try:
+                await asyncio.wait((self._current,))
+            finally:
+                self._current = None
+    
+    async def _translate_and_send(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        callback,
+        send_original: bool
+    ):
+        """翻译 interim 文本并通过回调发送结果"""
+        try:
+            translated = await self.translate_interim(text, source_language, target_language)
+            
+            # 通过回调发送结果（同步模式下原文和译文一起发送）
+            if translated:
+                if send_original:
+                    await callback(text, source_language, target_language, translated, is_final=False, send_original=True)
+                else:
+                    await callback(text, source_language, target_language, translated, is_final=False)
+        except Exception as e:
+            logger.error(f"Error in debounced translation: {e}")
+    
     async def translate_debounced(
         self,
         text: str,
@@ -353,42 +1192,22 @@ class DebouncedTranslator:
         target_language: str,
         callback
     ):
-        """带防抖的翻译：取消之前的请求，延迟执行新请求"""
+        """带防抖的翻译：新请求覆盖旧请求，延迟执行"""
         # 禁用防抖时，直接执行翻译
         if not self.enabled:
-            if self.pending_task and not self.pending_task.done():
-                self.pending_task.cancel()
-                self.pending_task = None
+            self._clear_pending()
 
-            translated = await self.translate_text(text, source_language, target_language)
+            translated = await self.translate_interim(text, source_language, target_language)
 
             if translated:
-                await callback(text, source_language, translated, is_final=False)
+                await callback(text, source_language, target_language, translated, is_final=False)
             return
 
-        # 取消之前的待处理任务
-        if self.pending_task and not self.pending_task.done():
-            self.pending_task.cancel()
-
-        async def delayed_translate():
-            try:
-                # 等待防抖延迟
-                await asyncio.sleep(self.debounce_delay)
-                
-                # 执行翻译
-                translated = await self.translate_text(text, source_language, target_language)
-                
-                # 通过回调发送结果
-                if translated:
-                    await callback(text, source_language, translated, is_final=False)
-                    
-            except asyncio.CancelledError:
-                logger.debug(f"Debounced translation cancelled for: {text[:30]}...")
-            except Exception as e:
-                logger.error(f"Error in debounced translation: {e}")
-        
-        # 创建新的待处理任务
-        self.pending_task = asyncio.create_task(delayed_translate())
+        self._schedule(
+            text, source_language, target_language, callback,
+            send_original=False,
+            delay=self.debounce_delay
+        )
     
     async def translate_sync(
         self,
@@ -398,38 +1217,38 @@ class DebouncedTranslator:
         callback
     ):
         """同步模式翻译：等待翻译完成后，原文和译文一起发送"""
-        # 取消之前的待处理任务
-        if self.pending_task and not self.pending_task.done():
-            self.pending_task.cancel()
-
-        async def delayed_translate():
-            try:
-                # 等待防抖延迟（如果启用）
-                if self.enabled:
-                    await asyncio.sleep(self.debounce_delay)
-                
-                # 执行翻译
-                translated = await self.translate_text(text, source_language, target_language)
-                
-                # 原文和译文一起发送
-                if translated:
-                    await callback(text, source_language, translated, is_final=False, send_original=True)
-                    
-            except asyncio.CancelledError:
-                logger.debug(f"Sync translation cancelled for: {text[:30]}...")
-            except Exception as e:
-                logger.error(f"Error in sync translation: {e}")
-        
-        # 创建新的待处理任务
-        self.pending_task = asyncio.create_task(delayed_translate())
+        # 禁用防抖时不等待，直接交给 worker 执行
+        self._schedule(
+            text, source_language, target_language, callback,
+            send_original=True,
+            delay=self.debounce_delay if self.enabled else 0
+        )
     
     def cancel_pending_interim(self):
         """取消待处理的interim翻译（由final调用）"""
-        if self.pending_task and not self.pending_task.done():
-            self.pending_task.cancel()
+        # 句段结束，下一句段重新累积已完成句子；下一句段的第一条 interim 立即翻译
+        self._stable = ("", "", "", "")
+        self._last_request = float("-inf")
+        cancelled = self._clear_pending()
+        if self._current and not self._current.done():
+            self._current.cancel()
+            cancelled = True
+        if cancelled:
             logger.info("✅ Cancelled pending interim translation (final arrived)")
-            return True
-        return False
+        return cancelled
+    
+    async def aclose(self):
+        """停止常驻 worker"""
+        self._clear_pending()
+        if self._current and not self._current.done():
+            self._current.cancel()
+        if self._worker and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
 
 
 class TranslationAgent(Agent):
@@ -444,7 +1263,8 @@ class TranslationAgent(Agent):
         batch_timeout_ms: float = 500,
         sync_display_mode: bool = False,
         bidirectional_mode: bool = False,
-        stt_provider: str = "deepgram"  # "deepgram" or "azure"
+        stt_provider: str = "deepgram",  # "deepgram" or "azure"
+        cache_redis_url: Optional[str] = None
     ):
         # 配置 STT - 支持 Deepgram 和 Azure
         logger.info(f"Initializing STT with provider: {stt_provider}, bidirectional_mode: {bidirectional_mode}")
@@ -521,8 +1341,13 @@ class TranslationAgent(Agent):
         )
         
         self.ctx = ctx
+        # STT 使用原始区域代码，翻译使用规范化后的代码（避免 en-US -> en 被当作不同语言翻译）
+        source_language = _LANG_MAP.get(source_language, source_language)
+        target_language = _LANG_MAP.get(target_language, target_language)
         self.source_language = source_language
         self.target_language = target_language
+        # 默认翻译方向 (source, target)，STT 热路径每个事件只读取一次
+        self._lang_pair = (source_language, target_language)
         self.debounce_enabled = debounce_enabled
         self.sync_display_mode = sync_display_mode  # 同步显示模式
         self.bidirectional_mode = bidirectional_mode  # 双向翻译模式
@@ -533,6 +1358,21 @@ class TranslationAgent(Agent):
             sync_mode=sync_display_mode
         )
         
+        # 前端参与者 identity（由房间事件维护，RPC 发送时无需遍历参与者列表）
+        self._client_identities: tuple = ()
+        # 后台发送中的 interim RPC 任务（持有引用，避免被垃圾回收；按创建顺序）
+        self._rpc_tasks: Dict[asyncio.Task, None] = {}
+        # RPC 消息序号（单调递增），前端据此丢弃乱序到达的过期 interim
+        self._seq = 0
+        # 合并窗口内待发送的 interim：(原文, 原文语言, 译文, 译文语言)
+        self._pending_interim: Optional[tuple] = None
+        # 最近一次实际发送的 interim（同上格式），内容完全相同时不再重复发送
+        self._last_sent_interim: Optional[tuple] = None
+        # 当前句段的 Google 语言检测结果 (检测时的文本, 语言)：interim 仍以该文本开头时直接复用，
+        # FINAL 时随句子交给批量翻译并清除
+        self._segment_detection: Optional[tuple] = None
+        self._interim_flush_handle: Optional[asyncio.TimerHandle] = None
+        
         # 用于跟踪上一次发送的完整文本，以计算增量
         self.last_sent_original = ""
         self.last_sent_translation = ""
@@ -546,7 +1386,10 @@ class TranslationAgent(Agent):
         
         # 批量翻译器
         self.batch_translator = BatchTranslator(
-            translate_client=self.translator.translate_client
+            translate_client=self.translator.translate_client,
+            parent=self.translator.parent,
+            api_semaphore=self.translator.api_semaphore,
+            cache=TranslationCache(redis_url=cache_redis_url)
         )
         
         # 顺序分发器
@@ -558,7 +1401,8 @@ class TranslationAgent(Agent):
         self.batch_collector = AdaptiveBatchCollector(
             batch_size=batch_size,
             batch_timeout_ms=batch_timeout_ms,
-            translate_callback=self._handle_batch_translation
+            translate_callback=self._handle_batch_translation,
+            overflow_callback=self._dispatch_untranslated
         )
         
         logger.info(
@@ -583,19 +1427,16 @@ class TranslationAgent(Agent):
         if not prev_text:
             return current_text
         
-        if not current_text:
+        # 同一字符串对象（如合并窗口沿用的上一条译文）：无变化，无需比较内容
+        if current_text is prev_text or not current_text:
             return ""
         
-        # 找到最长公共前缀
-        common_prefix_len = 0
-        min_len = min(len(prev_text), len(current_text))
-        
-        while common_prefix_len < min_len and prev_text[common_prefix_len] == current_text[common_prefix_len]:
-            common_prefix_len += 1
+        # 常见情况：interim 只在末尾追加文本，一次 startswith 即可判断
+        if current_text.startswith(prev_text):
+            return current_text[len(prev_text):]
         
-        # 返回新增/修改的部分
-        delta = current_text[common_prefix_len:]
-        return delta
+        # 找到最长公共前缀，返回新增/修改的部分
+        return current_text[_common_prefix_len(prev_text, current_text):]
     
     async def update_config(
         self, 
@@ -610,19 +1451,21 @@ class TranslationAgent(Agent):
         - TRANSLATION_DEBOUNCE_ENABLED: 是否启用防抖
         """
         if source_language:
-            self.source_language = source_language
+            self.source_language = _LANG_MAP.get(source_language, source_language)
             logger.info(f"Source language updated to: {source_language}")
         
         if target_language:
-            self.target_language = target_language
+            self.target_language = _LANG_MAP.get(target_language, target_language)
             logger.info(f"Target language updated to: {target_language}")
         
+        self._lang_pair = (self.source_language, self.target_language)
+        
         if sync_display_mode is not None:
             self.sync_display_mode = sync_display_mode
             self.translator.update_sync_mode(sync_display_mode)
             logger.info(f"Sync display mode updated to: {sync_display_mode}")
     
-    def _determine_translation_direction(self, detected_language: Optional[str], text: Optional[str] = None) -> tuple[str, str]:
+    async def _determine_translation_direction(self, detected_language: Optional[str], text: Optional[str] = None) -> tuple[str, str]:
         """
         根据检测到的语言决定翻译方向
         
@@ -633,57 +1476,114 @@ class TranslationAgent(Agent):
         Returns:
             (source_language, target_language) 元组
         """
+        direction = self._local_translation_direction(detected_language, text)
+        if direction is None:
+            # 需要 Google Translate 检测语言
+            direction = self._direction_for_language(await self._detect_language(text))
+        return direction
+    
+    def _local_translation_direction(self, detected_language: Optional[str], text: Optional[str]) -> Optional[tuple]:
+        """不调用 API 即可确定的翻译方向；需要 Google Translate 检测语言时返回 None"""
         # 检测拼音误识别：如果 Azure 说是英文，但文本看起来像拼音
-        if detected_language and detected_language.lower().startswith('en') and text:
-            # 简单的拼音模式检测
-            pinyin_patterns = ['NI ', 'ni ', 'hao', 'HAO', 'ma ', 'MA ', 'shi ', 'SHI ']
-            looks_like_pinyin = any(pattern in text for pattern in pinyin_patterns)
-            
-            if looks_like_pinyin and self.translator.translate_client:
+        if detected_language and _short_language(detected_language) == 'en' and text:
+            # 简单的拼音模式检测（单次正则扫描）
+            if _PINYIN_RE.search(text) and self.translator.translate_client:
                 logger.warning(f"⚠️ Azure detected 'en' but text looks like pinyin: '{text[:30]}...'")
                 logger.info("🔄 Using Google Translate to re-detect language")
                 # 强制使用 Google 重新检测
-                detected_language = None
+                return None
         
-        # 如果没有检测到语言，或强制重新检测，尝试使用 Google Translate 检测
-        if not detected_language and text and self.translator.translate_client:
-            try:
-                # Google Translate API 的 detect_language 方法
-                detection = self.translator.translate_client.detect_language(text)
-                if detection and 'language' in detection:
-                    detected_language = detection['language']
-                    confidence = detection.get('confidence', 0)
-                    logger.info(
-                        f"🔍 [Google Translate Fallback] Detected language: {detected_language} "
-                        f"(confidence: {confidence:.2f}) for text: '{text[:30]}...'"
-                    )
-            except Exception as e:
-                logger.debug(f"Google Translate language detection failed: {e}")
+        # 如果没有检测到语言：含汉字直接判定为中文，否则使用 Google Translate 检测
+        if not detected_language and text:
+            if _CJK_RE.search(text):
+                detected_language = "zh"
+            elif self.translator.translate_client:
+                return None
         
+        return self._direction_for_language(detected_language)
+    
+    def _direction_for_language(self, detected_language: Optional[str]) -> tuple:
+        """检测到的语言 -> 翻译方向"""
         # 如果还是没有检测到语言，使用默认配置
         if not detected_language:
             logger.debug("No language detected, using default translation direction")
-            return (self.source_language, self.target_language)
+            return self._lang_pair
         
         # 规范化语言代码（Azure返回 "zh-CN", Google Translate 使用 "zh"）
-        detected_lang_normalized = detected_language.lower()
-        
-        # 判断是中文还是英文
-        is_chinese = detected_lang_normalized.startswith('zh')
-        is_english = detected_lang_normalized.startswith('en')
-        
-        if is_chinese:
-            # 检测到中文 → 翻译成英文
-            logger.debug(f"Detected Chinese ({detected_language}), translating zh -> en")
-            return ("zh", "en")
-        elif is_english:
-            # 检测到英文 → 翻译成中文
-            logger.debug(f"Detected English ({detected_language}), translating en -> zh")
-            return ("en", "zh")
+        # 检测到中文 → 翻译成英文；检测到英文 → 翻译成中文
+        pair = _LANG_TO_PAIR.get(_short_language(detected_language))
+        if pair is not None:
+            logger.debug("Detected %s, translating %s -> %s", detected_language, pair[0], pair[1])
+            return pair
+        
+        # 其他语言，使用默认配置
+        logger.warning(f"Unsupported language detected: {detected_language}, using default translation direction")
+        return self._lang_pair
+    
+    async def _detect_language(self, text: str) -> Optional[str]:
+        """调用 Google Translate 检测语言（结果按句段缓存），失败时返回 None"""
+        # 同一句段内 interim 不断增长：以已检测文本开头时沿用结果；
+        # 首次检测的文本过短时，句段增长到 DETECT_RELIABLE_CHARS 后再检测一次
+        segment = self._segment_detection
+        if segment is not None and text.startswith(segment[0]):
+            if len(segment[0]) >= DETECT_RELIABLE_CHARS or len(text) < DETECT_RELIABLE_CHARS:
+                return segment[1]
         else:
-            # 其他语言，使用默认配置
-            logger.warning(f"Unsupported language detected: {detected_language}, using default translation direction")
-            return (self.source_language, self.target_language)
+            segment = None
+        
+        try:
+            # Google Translate v3 API 的 detect_language 方法
+            async with self.translator.api_semaphore:
+                response = await self.translator.translate_client.detect_language(
+                    request={
+                        "parent": self.translator.parent,
+                        "content": text,
+                        "mime_type": "text/plain",
+                    },
+                    retry=_TRANSLATE_RETRY
+                )
+        except Exception as e:
+            logger.debug(f"Google Translate language detection failed: {e}")
+            response = None
+        
+        if response is None or not response.languages:
+            if segment is None:
+                return None
+            # 重新检测失败：沿用临时结果，本句段不再重试
+            self._segment_detection = (text, segment[1])
+            return segment[1]
+        
+        detected_language = response.languages[0].language_code
+        confidence = response.languages[0].confidence
+        logger.info(
+            f"🔍 [Google Translate Fallback] Detected language: {detected_language} "
+            f"(confidence: {confidence:.2f}) for text: '{text[:30]}...'"
+        )
+        
+        self._segment_detection = (text, detected_language)
+        return detected_language
+    
+    def _log_direction(self, sentence: PendingSentence, direction: tuple):
+        """显示翻译方向和原始语言检测结果"""
+        detection_source = "Azure" if sentence.detected_language else "Fallback"
+        logger.info(
+            f"[BIDIRECTIONAL] seq={sentence.sequence}, "
+            f"detected={sentence.detected_language or 'auto'} ({detection_source}), "
+            f"direction: {direction[0]} -> {direction[1]}, "
+            f"text: '{sentence.text[:30]}...'"
+        )
+    
+    def _dispatch_groups(self, groups: Dict[tuple, List[PendingSentence]], results: List[List[Optional[str]]]):
+        """按方向分组的译文添加到顺序分发器（包含语言信息），由分发器恢复原始顺序"""
+        for ((src_lang, tgt_lang), sentences), translations in zip(groups.items(), results):
+            for sentence, translated in zip(sentences, translations):
+                self.dispatcher.add_result(
+                    sequence=sentence.sequence,
+                    original_text=sentence.text,
+                    translated_text=translated,
+                    original_language=src_lang,  # 实际检测到的源语言
+                    translation_language=tgt_lang  # 实际的目标语言
+                )
     
     async def _handle_batch_translation(self, batch: List[PendingSentence]):
         """处理一批句子的翻译"""
@@ -694,44 +1594,67 @@ class TranslationAgent(Agent):
         texts = [s.text for s in batch]
         sequences = [s.sequence for s in batch]
         
-        logger.info(
-            f"[BATCH] Translating {len(batch)} sentences: "
-            f"seq={sequences}, texts={[t[:20]+'...' for t in texts]}"
-        )
+        # 惰性格式化：日志级别未启用时不构建消息
+        logger.info("[BATCH] Translating %d sentences: seq=%s", len(batch), sequences)
         
         # 在双向模式下，根据检测到的语言决定翻译方向
         if self.bidirectional_mode:
-            # 逐个处理每个句子，因为它们可能有不同的语言
+            # 先确定无需调用 API 的翻译方向（STT 语言、汉字、interim 阶段的句段检测结果），按方向分组：
+            # 同一方向的句子合并为一次批量请求
+            groups: Dict[tuple, List[PendingSentence]] = defaultdict(list)
+            # 需要 Google 检测语言的句子：不指定源语言翻译，检测结果随译文一起返回
+            undetected: List[PendingSentence] = []
             for sentence in batch:
-                # 确定翻译方向（可能使用 Google Translate 作为备用检测）
-                src_lang, tgt_lang = self._determine_translation_direction(
-                    sentence.detected_language, 
-                    sentence.text  # 传递文本用于备用语言检测
-                )
-                
-                # 显示翻译方向和原始语言检测结果
-                detection_source = "Azure" if sentence.detected_language else "Google Fallback"
-                logger.info(
-                    f"[BIDIRECTIONAL] seq={sentence.sequence}, "
-                    f"detected={sentence.detected_language or 'auto'} ({detection_source}), "
-                    f"direction: {src_lang} -> {tgt_lang}, "
-                    f"text: '{sentence.text[:30]}...'"
-                )
-                
-                translation_result = await self.batch_translator.translate_batch(
-                    texts=[sentence.text],
+                direction = self._local_translation_direction(sentence.detected_language, sentence.text)
+                if direction is None:
+                    if sentence.segment_language is None:
+                        undetected.append(sentence)
+                        continue
+                    # interim 阶段已检测过该句段的语言
+                    direction = self._direction_for_language(sentence.segment_language)
+                self._log_direction(sentence, direction)
+                groups[direction].append(sentence)
+            
+            # 未检测的句子大多是英文（中文已由汉字判断），先按英文的目标语言翻译
+            guess_target = _LANG_TO_PAIR["en"][1]
+            
+            # 不同方向的请求并发执行
+            calls = [
+                self.batch_translator.translate_batch(
+                    texts=[sentence.text for sentence in sentences],
                     source_language=src_lang,
                     target_language=tgt_lang
                 )
-                
-                # 添加到顺序分发器（包含语言信息）
-                await self.dispatcher.add_result(
-                    sequence=sentence.sequence,
-                    original_text=sentence.text,
-                    translated_text=translation_result[0] if translation_result else None,
-                    original_language=src_lang,  # 实际检测到的源语言
-                    translation_language=tgt_lang  # 实际的目标语言
-                )
+                for (src_lang, tgt_lang), sentences in groups.items()
+            ]
+            if undetected:
+                calls.append(self.batch_translator.translate_detect(
+                    [sentence.text for sentence in undetected], guess_target
+                ))
+            results = await asyncio.gather(*calls)
+            detect_results = results.pop() if undetected else []
+            self._dispatch_groups(groups, results)
+            
+            # 检测到的语言与猜测的方向不一致（如拼音被识别为中文）时按正确方向重新翻译
+            retry_groups: Dict[tuple, List[PendingSentence]] = defaultdict(list)
+            for sentence, (translated, detected) in zip(undetected, detect_results):
+                direction = self._direction_for_language(detected)
+                self._log_direction(sentence, direction)
+                if translated is not None and direction[1] == guess_target:
+                    self._dispatch_groups({direction: [sentence]}, [[translated]])
+                else:
+                    retry_groups[direction].append(sentence)
+            
+            if retry_groups:
+                results = await asyncio.gather(*(
+                    self.batch_translator.translate_batch(
+                        texts=[sentence.text for sentence in sentences],
+                        source_language=src_lang,
+                        target_language=tgt_lang
+                    )
+                    for (src_lang, tgt_lang), sentences in retry_groups.items()
+                ))
+                self._dispatch_groups(retry_groups, results)
         else:
             # 单向模式：批量翻译所有句子
             translations = await self.batch_translator.translate_batch(
@@ -742,7 +1665,7 @@ class TranslationAgent(Agent):
             
             # 添加到顺序分发器
             for i, sentence in enumerate(batch):
-                await self.dispatcher.add_result(
+                self.dispatcher.add_result(
                     sequence=sentence.sequence,
                     original_text=sentence.text,
                     translated_text=translations[i] if i < len(translations) else None,
@@ -750,6 +1673,15 @@ class TranslationAgent(Agent):
                     translation_language=self.target_language
                 )
     
+    def _dispatch_untranslated(self, sentence: PendingSentence):
+        """积压溢出的句子：不翻译，按序号把原文交给顺序分发器"""
+        self.dispatcher.add_result(
+            sequence=sentence.sequence,
+            original_text=sentence.text,
+            translated_text=None,
+            original_language=_short_language(sentence.detected_language) if sentence.detected_language else None
+        )
+    
     async def _send_to_frontend_final(
         self,
         original_text: str,
@@ -767,6 +1699,60 @@ class TranslationAgent(Agent):
             is_final=is_final
         )
     
+    def bind_room(self, room: rtc.Room):
+        """跟踪前端参与者的加入/离开，缓存 RPC 目标 identity（可在房间连接前调用）"""
+        def refresh_identities(*_):
+            self.refresh_client_identities(room)
+        
+        refresh_identities()
+        
+        def on_participant_connected(participant: rtc.RemoteParticipant):
+            if participant.identity not in self._client_identities:
+                self._client_identities += (participant.identity,)
+        
+        def on_participant_disconnected(participant: rtc.RemoteParticipant):
+            self._client_identities = tuple(
+                identity for identity in self._client_identities if identity != participant.identity
+            )
+        
+        room.on("connected", refresh_identities)
+        room.on("reconnected", refresh_identities)
+        room.on("participant_connected", on_participant_connected)
+        room.on("participant_disconnected", on_participant_disconnected)
+    
+    def refresh_client_identities(self, room: rtc.Room):
+        """按房间当前的参与者重建 identity 缓存：连接（或重连）前已在房间中的参与者不会触发 participant_connected"""
+        self._client_identities = tuple(room.remote_participants)
+    
+    async def _perform_rpc(self, identities: tuple, payload: str):
+        """将 payload 发送到所有前端参与者，多个参与者时并发发送"""
+        local_participant = self.ctx.room.local_participant
+        if len(identities) == 1:
+            try:
+                await local_participant.perform_rpc(
+                    destination_identity=identities[0],
+                    method="receive_translation",
+                    payload=payload
+                )
+            except Exception as e:
+                logger.warning(f"Failed to send translation via RPC: {e}")
+            return
+        
+        results = await asyncio.gather(
+            *(
+                local_participant.perform_rpc(
+                    destination_identity=identity,
+                    method="receive_translation",
+                    payload=payload
+                )
+                for identity in identities
+            ),
+            return_exceptions=True
+        )
+        for identity, result in zip(identities, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send translation via RPC to {identity}: {result}")
+    
     async def send_translation_to_frontend(
         self, 
         original_text: str, 
@@ -778,6 +1764,7 @@ class TranslationAgent(Agent):
         """
         通过 RPC 发送翻译数据到前端
         同时发送 full_text 和 delta，支持增量渲染和纠错
+        interim 在短时间窗口内合并，只发送最新的一条；final 立即发送
         
         Args:
             original_text: 原文
@@ -790,66 +1777,135 @@ class TranslationAgent(Agent):
             logger.debug("No room context available for RPC")
             return
         
-        try:
-            # 获取远程参与者（前端客户端）
-            remote_participants = list(self.ctx.room.remote_participants.values())
-            if not remote_participants:
-                logger.debug("No remote participants found to send translation")
-                return
-            
-            # 发送到第一个远程参与者（前端）
-            client_participant = remote_participants[0]
-            
-            # 计算原文的 delta
-            original_delta = self.compute_delta(self.last_sent_original, original_text)
-            
-            # 计算译文的 delta
-            translation_delta = ""
-            if translated_text:
-                translation_delta = self.compute_delta(self.last_sent_translation, translated_text)
-            
-            # 准备翻译数据（包含 full_text 和 delta）
-            # 在双向模式下，translation_language 会动态变化
-            trans_lang = translation_language or self.target_language
-            
-            translation_data = {
-                "type": "final" if is_final else "interim",
-                "original": {
-                    "full_text": original_text,
-                    "delta": original_delta,
-                    "language": original_language
-                },
-                "translation": {
-                    "full_text": translated_text,
-                    "delta": translation_delta,
-                    "language": trans_lang
-                } if translated_text else None,
-                "timestamp": time.time()
-            }
+        # 发送到所有前端参与者
+        client_identities = self._client_identities
+        if not client_identities:
+            logger.debug("No remote participants found to send translation")
+            return
+        
+        if not is_final:
+            # 合并窗口内的 interim：新的覆盖旧的；新消息只有原文时保留旧消息中的译文
+            pending = self._pending_interim
+            if translated_text is None and pending is not None and pending[2] is not None:
+                translated_text, translation_language = pending[2], pending[3]
+            self._pending_interim = (original_text, original_language, translated_text, translation_language)
             
-            # 通过 RPC 发送
-            await self.ctx.room.local_participant.perform_rpc(
-                destination_identity=client_participant.identity,
-                method="receive_translation",
-                payload=json.dumps(translation_data)
+            if self._interim_flush_handle is None:
+                self._interim_flush_handle = asyncio.get_running_loop().call_later(
+                    INTERIM_FLUSH_DELAY, self._flush_interim
+                )
+            return
+        
+        try:
+            payload = self._build_payload(
+                original_text, original_language, translated_text, translation_language, is_final=True
             )
-            
-            # 更新已发送的文本（用于下一次 delta 计算）
-            if is_final:
-                # final 时重置，开始新的句子
-                self.last_sent_original = ""
-                self.last_sent_translation = ""
-            else:
-                # interim 时累积
-                self.last_sent_original = original_text
-                if translated_text:
-                    self.last_sent_translation = translated_text
-            
-            log_type = "FINAL" if is_final else "INTERIM"
-            logger.debug(f"[{log_type}] Sent to frontend: {original_language} -> {self.target_language}, delta: {len(original_delta)} chars")
-            
+            # final 需要保证顺序，等待发送完成
+            await self._perform_rpc(client_identities, payload)
+        except Exception as e:
+            logger.warning(f"Failed to send translation via RPC: {e}")
+    
+    def _drop_pending_interim(self) -> bool:
+        """FINAL 到达：丢弃合并窗口内尚未发送的同句 interim，由 final 携带完整内容"""
+        handle = self._interim_flush_handle
+        if handle is None:
+            return False
+        handle.cancel()
+        self._interim_flush_handle = None
+        self._pending_interim = None
+        return True
+    
+    def _flush_interim(self):
+        """合并窗口结束：在后台发送最新的 interim，STT 事件处理不等待网络往返"""
+        self._interim_flush_handle = None
+        pending = self._pending_interim
+        self._pending_interim = None
+        
+        client_identities = self._client_identities
+        if pending is None or not client_identities:
+            return
+        # 与上次发送的 interim 完全相同（如同一译文回调重复触发）：前端无需更新
+        if pending == self._last_sent_interim:
+            return
+        
+        try:
+            payload = self._build_payload(*pending, is_final=False)
         except Exception as e:
             logger.warning(f"Failed to send translation via RPC: {e}")
+            return
+        self._last_sent_interim = pending
+        
+        if len(self._rpc_tasks) >= MAX_INFLIGHT_INTERIM_RPCS:
+            # 最旧的 interim 已过时，取消它而不是让在途任务无限增长
+            oldest = next(iter(self._rpc_tasks))
+            del self._rpc_tasks[oldest]
+            oldest.cancel()
+        
+        task = asyncio.create_task(self._perform_rpc(client_identities, payload))
+        self._rpc_tasks[task] = None
+        task.add_done_callback(self._discard_rpc_task)
+    
+    def _discard_rpc_task(self, task: asyncio.Task):
+        self._rpc_tasks.pop(task, None)
+    
+    def _build_payload(
+        self,
+        original_text: str,
+        original_language: str,
+        translated_text: Optional[str],
+        translation_language: Optional[str],
+        is_final: bool
+    ) -> str:
+        """构建 RPC payload，并更新 delta 计算所需的已发送文本"""
+        # 计算原文的 delta
+        original_delta = self.compute_delta(self.last_sent_original, original_text)
+        
+        # 准备翻译数据（包含 full_text 和 delta）
+        # 只有原文时（interim 异步模式的常见情况）不计算译文 delta，也不构建译文部分
+        if translated_text:
+            # 在双向模式下，translation_language 会动态变化
+            translation = {
+                "full_text": translated_text,
+                "delta": self.compute_delta(self.last_sent_translation, translated_text),
+                "language": translation_language or self.target_language
+            }
+        else:
+            translation = None
+        
+        self._seq += 1
+        translation_data = {
+            "type": "final" if is_final else "interim",
+            "seq": self._seq,
+            "original": {
+                "full_text": original_text,
+                "delta": original_delta,
+                "language": original_language
+            },
+            "translation": translation,
+            # 整数毫秒（与前端 JS Date.now() 同单位），序列化比浮点秒更省
+            "timestamp": time.time_ns() // 1000000
+        }
+        
+        payload = _json_dumps(translation_data)
+        
+        # 更新已发送的文本（用于下一次 delta 计算）
+        if is_final:
+            # final 时重置，开始新的句子
+            self.last_sent_original = ""
+            self.last_sent_translation = ""
+            self._last_sent_interim = None
+        else:
+            # interim 时累积
+            self.last_sent_original = original_text
+            if translated_text:
+                self.last_sent_translation = translated_text
+        
+        logger.debug(
+            "[%s] Sent to frontend: %s -> %s, delta: %d chars",
+            "FINAL" if is_final else "INTERIM", original_language, self.target_language, len(original_delta)
+        )
+        
+        return payload
     
     async def stt_node(
         self, 
@@ -865,135 +1921,178 @@ class TranslationAgent(Agent):
         async def process_stream():
             # 跟踪最近的 interim 文本，用于去重和优化
             last_interim_text = ""
+            # 最近一次 interim 译文对应的 (原文, 源语言, 目标语言, 译文)
+            last_translated = ("", "", "", "")
+            
+            # 会话内不变的属性提前取为局部变量，避免每个事件重复 self.* 查找
+            # （语言对与显示模式可经 update_config 修改，仍每次读取）
+            send = self.send_translation_to_frontend
+            translator = self.translator
+            dispatcher = self.dispatcher
+            batch_collector = self.batch_collector
+            bidirectional = self.bidirectional_mode
+            azure_language = self.stt_provider == "azure" and bidirectional
             
-            async def translation_callback(original: str, source: str, translated: str, is_final: bool, send_original: bool = False):
+            async def translation_callback(
+                original: str,
+                source: str,
+                target: str,
+                translated: str,
+                is_final: bool,
+                send_original: bool = False
+            ):
                 """翻译完成后的回调
                 
                 Args:
                     send_original: True时表示同步模式，原文和译文一起发送
                 """
-                await self.send_translation_to_frontend(
+                nonlocal last_translated
+                last_translated = (original, source, target, translated)
+                # 异步模式下原文已先行发送：译文返回时若已有更新的 interim，
+                # 随屏幕上最新的原文一起发送，避免前端原文回退到旧文本
+                if not send_original and last_interim_text:
+                    original = last_interim_text
+                await send(
                     original_text=original,
                     original_language=source,
                     translated_text=translated,
+                    translation_language=target,
                     is_final=is_final
                 )
             
             async for event in parent_stream:
                 # 处理 STT 的转录事件（支持 Deepgram 和 Azure）
-                if hasattr(event, 'alternatives') and event.alternatives:
-                    for alt in event.alternatives:
-                        if hasattr(alt, 'text') and alt.text:
-                            transcript = alt.text.strip()
-                            
-                            if not transcript:
-                                continue
-                            
-                            # 提取检测到的语言（Azure STT 持续语言检测模式）
-                            detected_language = None
-                            if self.stt_provider == "azure" and self.bidirectional_mode:
-                                # 尝试从不同位置获取语言信息
-                                # Azure 在持续语言检测模式下会在每个结果中返回语言
-                                if hasattr(event, 'language') and event.language:
-                                    detected_language = event.language
-                                    logger.debug(f"🔍 [Azure] Detected language: {detected_language}")
-                                elif hasattr(alt, 'language') and alt.language:
-                                    detected_language = alt.language
-                                    logger.debug(f"🔍 [Azure] Detected language from alt: {detected_language}")
-                                
-                                # 如果仍然没有检测到语言，记录警告
-                                if not detected_language:
-                                    logger.debug(f"⚠️ [Azure] No language detected for: '{transcript[:30]}...'")
-                            
-                            # 判断是 interim 还是 final
-                            is_final = False
-                            if hasattr(event, 'type'):
-                                event_type = str(event.type)
-                                is_final = 'FINAL' in event_type or 'final' in event_type.lower()
-                            elif hasattr(event, 'is_final'):
-                                is_final = event.is_final
-                            elif hasattr(alt, 'is_final'):
-                                is_final = alt.is_final
+                # SpeechEvent/SpeechData 是固定字段的 dataclass，直接取属性，无需逐个 hasattr 探测
+                # 判断是 interim 还是 final（直接比较枚举，无需字符串转换），每个事件只算一次
+                is_final = event.type is SpeechEventType.FINAL_TRANSCRIPT
+                # 只处理最优候选：其余 N-best 候选会重复分配序号、重复翻译同一句话
+                for alt in event.alternatives[:1]:
+                    transcript = alt.text.strip()
+                    
+                    if not transcript:
+                        continue
+                    
+                    # 提取检测到的语言（Azure STT 持续语言检测模式）
+                    detected_language = None
+                    if azure_language:
+                        # Azure 在持续语言检测模式下会在每个结果中返回语言
+                        detected_language = alt.language or None
+                        if detected_language:
+                            logger.debug("🔍 [Azure] Detected language: %s", detected_language)
+                        else:
+                            # 没有检测到语言，记录警告
+                            logger.debug("⚠️ [Azure] No language detected for: '%.30s...'", transcript)
+                    
+                    if is_final:
+                        # ═══════════════════════════════
+                        # FINAL 结果：自适应批量翻译
+                        # ═══════════════════════════════
+                        
+                        # 分配全局序号
+                        sequence = self.sentence_sequence
+                        self.sentence_sequence += 1
+                        
+                        # 记录包含语言信息的日志
+                        lang_info = f", lang={detected_language}" if detected_language else ""
+                        logger.info(
+                            f"[FINAL] seq={sequence}{lang_info}, "
+                            f"text='{transcript[:50]}...'"
+                        )
+                        
+                        # ✅ 优化1：取消无效的interim翻译，并丢弃合并窗口内尚未发送的interim
+                        cancelled = translator.cancel_pending_interim()
+                        cancelled = self._drop_pending_interim() or cancelled
+                        # 新句段的 interim 即使与上一句最后发送的相同，也需要显示
+                        self._last_sent_interim = None
+                        # interim 阶段的检测结果随句子交给批量翻译，新句段重新检测语言
+                        segment = self._segment_detection
+                        segment_language = segment[1] if segment is not None else None
+                        self._segment_detection = None
+                        if cancelled:
+                            logger.debug("[FINAL] Cancelled interim for '%.30s...'", transcript)
+                        
+                        if not bidirectional and self.source_language == self.target_language:
+                            # 源语言与目标语言相同：无需翻译，跳过批量等待直接交给顺序分发器
+                            dispatcher.add_result(
+                                sequence=sequence,
+                                original_text=transcript,
+                                translated_text=transcript,
+                                original_language=self.source_language,
+                                translation_language=self.target_language
+                            )
+                        else:
+                            # ✅ 优化2：加入自适应批量收集器（同步调用，不阻塞），传递检测到的语言
+                            batch_collector.add_sentence(sequence, transcript, detected_language, segment_language)
+                        
+                        # 清除 interim 缓存
+                        last_interim_text = ""
+                        last_translated = ("", "", "", "")
+                        
+                    else:
+                        # INTERIM 结果：使用防抖机制
+                        # 避免重复处理相同的文本
+                        if transcript == last_interim_text:
+                            continue
+                        
+                        last_interim_text = transcript
+                        
+                        # 记录 interim 结果（包含语言信息）
+                        logger.debug("[INTERIM] lang=%s: %.50s...", detected_language, transcript)
+                        
+                        # 在双向模式下，确定翻译方向
+                        src_lang, tgt_lang = self._lang_pair
+                        if bidirectional:
+                            src_lang, tgt_lang = await self._determine_translation_direction(
+                                detected_language, 
+                                transcript
+                            )
+                        
+                        # 相比已翻译的原文只追加了空白/标点：复用译文，不调用 API
+                        translated_original, translated_source, translated_target, translated = last_translated
+                        if (
+                            translated
+                            and translated_source == src_lang
+                            and translated_target == tgt_lang
+                            and not translator.has_pending
+                            and transcript.startswith(translated_original)
+                            and not transcript[len(translated_original):].strip(_TRIVIAL_CHARS)
+                        ):
+                            await send(
+                                original_text=transcript,
+                                original_language=src_lang,
+                                translated_text=translated,
+                                translation_language=tgt_lang,
+                                is_final=False
+                            )
+                            continue
+                        
+                        # 根据同步显示模式选择不同的处理方式
+                        if self.sync_display_mode:
+                            # 同步模式：等译文准备好后，原文和译文一起发送
+                            logger.debug("[INTERIM-SYNC] Waiting for translation before sending")
+                            await translator.translate_sync(
+                                text=transcript,
+                                source_language=src_lang,
+                                target_language=tgt_lang,
+                                callback=translation_callback
+                            )
+                        else:
+                            # 异步模式（默认）：先发送原文到前端（实时显示）
+                            await send(
+                                original_text=transcript,
+                                original_language=src_lang,
+                                translated_text=None,
+                                translation_language=tgt_lang,
+                                is_final=False
+                            )
                             
-                            if is_final:
-                                # ═══════════════════════════════
-                                # FINAL 结果：自适应批量翻译
-                                # ═══════════════════════════════
-                                
-                                # 分配全局序号
-                                sequence = self.sentence_sequence
-                                self.sentence_sequence += 1
-                                
-                                # 记录包含语言信息的日志
-                                lang_info = f", lang={detected_language}" if detected_language else ""
-                                logger.info(
-                                    f"[FINAL] seq={sequence}{lang_info}, "
-                                    f"text='{transcript[:50]}...'"
-                                )
-                                
-                                # ✅ 优化1：取消无效的interim翻译
-                                cancelled = self.translator.cancel_pending_interim()
-                                if cancelled:
-                                    logger.debug(
-                                        f"[FINAL] Cancelled interim for '{transcript[:30]}...'"
-                                    )
-                                
-                                # ✅ 优化2：加入自适应批量收集器（不阻塞），传递检测到的语言
-                                asyncio.create_task(
-                                    self.batch_collector.add_sentence(sequence, transcript, detected_language)
-                                )
-                                
-                                # 清除 interim 缓存
-                                last_interim_text = ""
-                                
-                            else:
-                                # INTERIM 结果：使用防抖机制
-                                # 避免重复处理相同的文本
-                                if transcript == last_interim_text:
-                                    continue
-                                
-                                last_interim_text = transcript
-                                
-                                # 记录 interim 结果（包含语言信息）
-                                lang_info = f", lang={detected_language}" if detected_language else ""
-                                logger.debug(f"[INTERIM]{lang_info}: {transcript[:50]}...")
-                                
-                                # 在双向模式下，确定翻译方向
-                                src_lang = self.source_language
-                                tgt_lang = self.target_language
-                                if self.bidirectional_mode:
-                                    src_lang, tgt_lang = self._determine_translation_direction(
-                                        detected_language, 
-                                        transcript
-                                    )
-                                
-                                # 根据同步显示模式选择不同的处理方式
-                                if self.sync_display_mode:
-                                    # 同步模式：等译文准备好后，原文和译文一起发送
-                                    logger.debug(f"[INTERIM-SYNC] Waiting for translation before sending")
-                                    await self.translator.translate_sync(
-                                        text=transcript,
-                                        source_language=src_lang,
-                                        target_language=tgt_lang,
-                                        callback=translation_callback
-                                    )
-                                else:
-                                    # 异步模式（默认）：先发送原文到前端（实时显示）
-                                    await self.send_translation_to_frontend(
-                                        original_text=transcript,
-                                        original_language=src_lang,
-                                        translated_text=None,
-                                        translation_language=tgt_lang,
-                                        is_final=False
-                                    )
-                                    
-                                    # 使用防抖机制翻译 interim 结果
-                                    await self.translator.translate_debounced(
-                                        text=transcript,
-                                        source_language=src_lang,
-                                        target_language=tgt_lang,
-                                        callback=translation_callback
-                                    )
+                            # 使用防抖机制翻译 interim 结果
+                            await translator.translate_debounced(
+                                text=transcript,
+                                source_language=src_lang,
+                                target_language=tgt_lang,
+                                callback=translation_callback
+                            )
                 
                 yield event
         
@@ -1001,66 +2100,60 @@ class TranslationAgent(Agent):
 
 
 async def entrypoint(ctx: JobContext):
-    # 默认配置：英语到中文，500ms 防抖
-    source_language = os.getenv("TRANSLATION_SOURCE_LANGUAGE", "en")
-    target_language = os.getenv("TRANSLATION_TARGET_LANGUAGE", "zh")
-    debounce_ms = float(os.getenv("TRANSLATION_DEBOUNCE_MS", "500"))
-    debounce_enabled_env = os.getenv("TRANSLATION_DEBOUNCE_ENABLED", "true")
-    debounce_enabled = debounce_enabled_env.strip().lower() in {"1", "true", "yes", "on"}
-    
-    # 批量翻译配置
-    batch_size = int(os.getenv("TRANSLATION_BATCH_SIZE", "3"))
-    batch_timeout_ms = float(os.getenv("TRANSLATION_BATCH_TIMEOUT_MS", "2000"))  # 2秒，匹配实际语速
-    
-    # 显示模式配置（默认异步模式）
-    sync_display_mode_env = os.getenv("TRANSLATION_SYNC_DISPLAY_MODE", "false")
-    sync_display_mode = sync_display_mode_env.strip().lower() in {"1", "true", "yes", "on"}
-    
-    # 双向翻译模式配置（默认关闭）
-    bidirectional_mode_env = os.getenv("TRANSLATION_BIDIRECTIONAL_MODE", "false")
-    bidirectional_mode = bidirectional_mode_env.strip().lower() in {"1", "true", "yes", "on"}
-    
-    # STT 提供商配置（默认 deepgram）
-    stt_provider = os.getenv("STT_PROVIDER", "deepgram").strip().lower()
-    if stt_provider not in ["deepgram", "azure"]:
-        logger.warning(f"Invalid STT_PROVIDER '{stt_provider}', falling back to 'deepgram'")
-        stt_provider = "deepgram"
-    
     # 创建带上下文的 agent
     agent = TranslationAgent(
         ctx=ctx,
-        source_language=source_language,
-        target_language=target_language,
-        debounce_ms=debounce_ms,
-        debounce_enabled=debounce_enabled,
-        batch_size=batch_size,
-        batch_timeout_ms=batch_timeout_ms,
-        sync_display_mode=sync_display_mode,
-        bidirectional_mode=bidirectional_mode,
-        stt_provider=stt_provider
+        source_language=CONFIG.source_language,
+        target_language=CONFIG.target_language,
+        debounce_ms=CONFIG.debounce_ms,
+        debounce_enabled=CONFIG.debounce_enabled,
+        batch_size=CONFIG.batch_size,
+        batch_timeout_ms=CONFIG.batch_timeout_ms,
+        sync_display_mode=CONFIG.sync_display_mode,
+        bidirectional_mode=CONFIG.bidirectional_mode,
+        stt_provider=CONFIG.stt_provider,
+        cache_redis_url=CONFIG.cache_redis_url
     )
     
     session = AgentSession()
     
+    # 缓存前端参与者 identity：在 session 启动前绑定，启动期间的 RPC 和加入的参与者不会遗漏
+    agent.bind_room(ctx.room)
+    
+    # 任务结束时停止防抖 worker，关闭翻译缓存连接
+    ctx.add_shutdown_callback(agent.translator.aclose)
+    ctx.add_shutdown_callback(agent.batch_translator.cache.aclose)
+    
     # 启动 session（会自动连接房间并初始化 pre-connect audio buffer）
     await session.start(
         agent=agent,
         room=ctx.room
     )
+    # 房间已连接：同步一次在 agent 加入前就已在房间中的参与者
+    agent.refresh_client_identities(ctx.room)
+    
+    # 最近一次已应用的配置签名，前端重复发送相同配置时直接跳过
+    last_config_sig = None
     
     # 注册 RPC 方法：接收前端的语言配置更新
     async def handle_update_config(data: rtc.RpcInvocationData) -> str:
+        nonlocal last_config_sig
         try:
-            config = json.loads(data.payload)
+            config = _json_loads(data.payload)
+            config_sig = (config.get('source'), config.get('target'), config.get('syncDisplayMode'))
+            if config_sig == last_config_sig:
+                return _json_dumps({"status": "noop", "message": "Configuration unchanged"})
+            
             await agent.update_config(
                 source_language=config.get('source'),
                 target_language=config.get('target'),
                 sync_display_mode=config.get('syncDisplayMode')
             )
-            return json.dumps({"status": "success", "message": "Configuration updated"})
+            last_config_sig = config_sig
+            return _json_dumps({"status": "success", "message": "Configuration updated"})
         except Exception as e:
             logger.error(f"Error updating config: {e}")
-            return json.dumps({"status": "error", "message": str(e)})
+            return _json_dumps({"status": "error", "message": str(e)})
     
     ctx.room.local_participant.register_rpc_method(
         "update_translation_config",
@@ -1068,6 +2161,15 @@ async def entrypoint(ctx: JobContext):
     )
 
 
+def _install_uvloop():
+    """已安装 uvloop 时使用 uvloop 事件循环（事件循环策略 API 自 Python 3.14 起弃用，不再设置）"""
+    if uvloop is None or sys.version_info >= (3, 14):
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 if __name__ == "__main__":
+    _install_uvloop()
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
 